@@ -1,8 +1,27 @@
+import os
+
 from setuptools import setup, find_packages
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
+# Opt-in AOT compilation for production deployments: set
+# CANFD_USE_MYPYC=1 (with mypy installed) to compile the hot modules
+# to C extensions. The pure-Python sources remain the default.
+ext_modules = []
+if os.environ.get("CANFD_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(
+        [
+            "src/canfd_handler.py",
+            "src/diagnostics_collector.py",
+            "src/dtc_decode.py",
+            "src/fleet_manager.py",
+            "src/uds_client.py",
+        ]
+    )
+
 setup(
     name="canfd-fleet-diagnostics",
     version="1.0.0",
@@ -18,12 +37,11 @@ setup(
         "Topic :: System :: Hardware",
         "License :: OSI Approved :: Apache Software License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
+    ext_modules=ext_modules,
     install_requires=[
         "python-can>=4.0.0",
         "python-uds>=1.3.0",
@@ -39,5 +57,8 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
         ],
+        "compiled": [
+            "mypy>=1.0.0",
+        ],
     },
 )
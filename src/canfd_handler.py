@@ -3,18 +3,28 @@ CAN-FD Handler Module
 Handles CAN-FD communication, frame processing, and data extraction
 """
 
+import array
+import binascii
+import collections
+import functools
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime
 import struct
+import time
+import types
+
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # numpy is optional; fall back to stdlib arrays
+    np = None
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CANFrame:
-    """CAN Frame data structure"""
+    """CAN Frame data structure (immutable)"""
     can_id: int
     dlc: int
     data: bytes
@@ -24,6 +34,99 @@ class CANFrame:
     flags: int = 0
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_frame_fields(
+    can_id: int,
+    dlc: int,
+    data: bytes,
+    timestamp: float,
+    is_extended: bool,
+    is_fd: bool,
+) -> Dict:
+    """Build the parsed-frame dict; cached since frames are immutable"""
+    return {
+        "can_id": f"0x{can_id:X}",
+        "dlc": dlc,
+        # hexlify + bytes.upper stay in C code; upper-casing before the
+        # ascii decode avoids a second pass over the Python string
+        "data_hex": binascii.hexlify(data).upper().decode('ascii'),
+        "timestamp": timestamp,
+        "is_extended": is_extended,
+        "is_fd": is_fd,
+    }
+
+
+class FrameStore:
+    """
+    Structure-of-arrays ring buffer for CAN frame metadata
+
+    Stores can_id/dlc/timestamp in three parallel typed arrays instead
+    of a list of CANFrame objects, so aggregate statistics run over
+    compact C buffers (vectorized with numpy when available) and
+    per-frame metadata costs ~13 bytes instead of a full dataclass.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        """
+        Initialize frame store
+
+        Args:
+            capacity: Ring buffer capacity (oldest frames overwritten)
+        """
+        self.capacity = capacity
+        self._head = 0
+        self._size = 0
+        if np is not None:
+            self._can_ids = np.zeros(capacity, dtype=np.uint32)
+            self._dlcs = np.zeros(capacity, dtype=np.uint8)
+            self._timestamps = np.zeros(capacity, dtype=np.float64)
+        else:
+            self._can_ids = array.array('I', bytes(4 * capacity))
+            self._dlcs = array.array('B', bytes(capacity))
+            self._timestamps = array.array('d', bytes(8 * capacity))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, can_id: int, dlc: int, timestamp: float):
+        """Record one frame's metadata into the ring buffer"""
+        idx = self._head
+        self._can_ids[idx] = can_id
+        self._dlcs[idx] = dlc
+        self._timestamps[idx] = timestamp
+        self._head = (idx + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def get_statistics(self) -> Dict:
+        """Compute aggregate statistics over the stored frames"""
+        n = self._size
+        if n == 0:
+            return {"frame_count": 0, "total_bytes": 0, "avg_dlc": 0.0, "unique_ids": 0}
+
+        if np is not None:
+            dlcs = self._dlcs[:n]
+            ids = self._can_ids[:n]
+            total_bytes = int(dlcs.sum())
+            unique_ids = int(np.unique(ids).size)
+        else:
+            dlcs = self._dlcs[:n]
+            total_bytes = sum(dlcs)
+            unique_ids = len(set(self._can_ids[:n]))
+
+        return {
+            "frame_count": n,
+            "total_bytes": total_bytes,
+            "avg_dlc": total_bytes / n,
+            "unique_ids": unique_ids,
+        }
+
+    def clear(self):
+        """Reset the ring buffer"""
+        self._head = 0
+        self._size = 0
+
+
 class CANFDHandler:
     """Handler for CAN-FD communication and frame management"""
     
@@ -38,14 +141,17 @@ class CANFDHandler:
         self.interface = interface
         self.bitrate = bitrate
         self.is_connected = False
-        self.frame_buffer: List[CANFrame] = []
-        self.statistics = {
+        # Bounded so a long-running collector cannot grow without limit
+        self.frame_buffer: collections.deque = collections.deque(maxlen=65536)
+        self.frame_store = FrameStore()
+        self.statistics: Dict[str, int] = {
             "frames_received": 0,
             "frames_sent": 0,
             "errors": 0,
             "bytes_received": 0,
         }
-        logger.info(f"CAN-FD Handler initialized for interface: {interface} @ {bitrate}bps")
+        self._stats_view = types.MappingProxyType(self.statistics)
+        logger.info("CAN-FD Handler initialized for interface: %s @ %dbps", interface, bitrate)
     
     def connect(self) -> bool:
         """
@@ -56,12 +162,12 @@ class CANFDHandler:
         """
         try:
             # Simulating CAN bus connection
-            logger.info(f"Connecting to {self.interface}...")
+            logger.info("Connecting to %s...", self.interface)
             self.is_connected = True
             logger.info("CAN-FD connection established")
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to CAN bus: {e}")
+            logger.error("Failed to connect to CAN bus: %s", e)
             return False
     
     def disconnect(self) -> bool:
@@ -102,15 +208,16 @@ class CANFDHandler:
                 can_id=can_id,
                 dlc=len(data),
                 data=data,
-                timestamp=datetime.now().timestamp(),
+                timestamp=time.time(),
                 is_extended=is_extended,
                 is_fd=True
             )
             self.statistics["frames_sent"] += 1
-            logger.debug(f"Frame sent: ID=0x{can_id:X}, DLC={len(data)}")
+            self.frame_store.record(frame.can_id, frame.dlc, frame.timestamp)
+            logger.debug("Frame sent: ID=0x%X, DLC=%d", can_id, len(data))
             return True
         except Exception as e:
-            logger.error(f"Failed to send frame: {e}")
+            logger.error("Failed to send frame: %s", e)
             self.statistics["errors"] += 1
             return False
     
@@ -128,14 +235,14 @@ class CANFDHandler:
             logger.warning("Cannot receive frames - not connected")
             return []
         
-        received_frames = []
+        received_frames: List[CANFrame] = []
         try:
             # Simulating frame reception
-            logger.debug(f"Listening for frames (timeout={timeout}s)...")
+            logger.debug("Listening for frames (timeout=%ss)...", timeout)
             # In production, this would use actual CAN library
             pass
         except Exception as e:
-            logger.error(f"Error receiving frames: {e}")
+            logger.error("Error receiving frames: %s", e)
             self.statistics["errors"] += 1
         
         self.statistics["frames_received"] += len(received_frames)
@@ -151,18 +258,33 @@ class CANFDHandler:
         Returns:
             Dictionary with parsed frame information
         """
-        return {
-            "can_id": f"0x{frame.can_id:X}",
-            "dlc": frame.dlc,
-            "data_hex": frame.data.hex().upper(),
-            "timestamp": frame.timestamp,
-            "is_extended": frame.is_extended,
-            "is_fd": frame.is_fd,
-        }
+        # Copy per call so mutating a parsed result cannot corrupt the
+        # cached entry shared by later lookups of the same frame
+        return dict(_parse_frame_fields(
+            frame.can_id,
+            frame.dlc,
+            frame.data,
+            frame.timestamp,
+            frame.is_extended,
+            frame.is_fd,
+        ))
     
-    def get_statistics(self) -> Dict:
-        """Get CAN bus statistics"""
+    def get_statistics(self) -> Mapping[str, int]:
+        """
+        Get CAN bus statistics
+
+        Returns:
+            Read-only view that reflects the live counters (no copy)
+        """
+        return self._stats_view
+
+    def get_statistics_snapshot(self) -> Dict[str, int]:
+        """Get a point-in-time copy of the CAN bus statistics"""
         return self.statistics.copy()
+
+    def get_frame_statistics(self) -> Dict:
+        """Get aggregate statistics over buffered frame metadata"""
+        return self.frame_store.get_statistics()
     
     def reset_statistics(self):
         """Reset statistics counters"""
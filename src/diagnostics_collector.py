@@ -4,15 +4,26 @@ Collects and aggregates vehicle diagnostic data from fleet
 """
 
 import logging
+from types import ModuleType
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 import json
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class VehicleDiagnostics:
     """Vehicle diagnostic data container"""
     vehicle_id: str
@@ -35,9 +46,14 @@ class DiagnosticsCollector:
             max_buffer_size: Maximum number of diagnostic records to buffer
         """
         self.max_buffer_size = max_buffer_size
-        self.diagnostics_buffer: List[VehicleDiagnostics] = []
+        self.diagnostics_buffer: deque = deque(maxlen=max_buffer_size)
         self.vehicle_profiles: Dict[str, Dict] = {}
-        logger.info(f"Diagnostics Collector initialized (buffer size: {max_buffer_size})")
+        self._per_vehicle: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        # Buffered records with at least one DTC, kept current on
+        # insert and eviction so summaries never rescan the buffer
+        self._with_dtc_count = 0
+        logger.info("Diagnostics Collector initialized (buffer size: %d)", max_buffer_size)
     
     def add_vehicle(self, vehicle_id: str, vehicle_info: Dict[str, Any]) -> bool:
         """
@@ -58,19 +74,19 @@ class DiagnosticsCollector:
                 "last_diagnostic": None,
                 "diagnostics_count": 0,
             }
-            logger.info(f"Vehicle added: {vehicle_id}")
+            logger.info("Vehicle added: %s", vehicle_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to add vehicle: {e}")
+            logger.error("Failed to add vehicle: %s", e)
             return False
     
     def collect_diagnostics(
         self,
         vehicle_id: str,
         dtc_codes: List[str],
-        engine_data: Dict = None,
-        emission_data: Dict = None,
-        performance_data: Dict = None,
+        engine_data: Optional[Dict] = None,
+        emission_data: Optional[Dict] = None,
+        performance_data: Optional[Dict] = None,
     ) -> Optional[VehicleDiagnostics]:
         """
         Collect diagnostic data for a vehicle
@@ -86,33 +102,42 @@ class DiagnosticsCollector:
             VehicleDiagnostics object or None if failed
         """
         if vehicle_id not in self.vehicle_profiles:
-            logger.warning(f"Vehicle {vehicle_id} not registered")
+            logger.warning("Vehicle %s not registered", vehicle_id)
             return None
         
         try:
             diagnostic = VehicleDiagnostics(
                 vehicle_id=vehicle_id,
-                timestamp=datetime.now().timestamp(),
+                timestamp=time.time(),
                 dtc_codes=dtc_codes or [],
                 engine_data=engine_data or {},
                 emission_data=emission_data or {},
                 performance_data=performance_data or {},
             )
             
-            # Add to buffer (FIFO)
-            if len(self.diagnostics_buffer) >= self.max_buffer_size:
-                self.diagnostics_buffer.pop(0)
-            
-            self.diagnostics_buffer.append(diagnostic)
-            
-            # Update vehicle profile
-            self.vehicle_profiles[vehicle_id]["last_diagnostic"] = diagnostic.timestamp
-            self.vehicle_profiles[vehicle_id]["diagnostics_count"] += 1
+            with self._lock:
+                # Add to buffer (deque evicts oldest in O(1) when full);
+                # account for the record the full deque is about to drop
+                if len(self.diagnostics_buffer) == self.max_buffer_size:
+                    if self.diagnostics_buffer[0].dtc_codes:
+                        self._with_dtc_count -= 1
+                if diagnostic.dtc_codes:
+                    self._with_dtc_count += 1
+                self.diagnostics_buffer.append(diagnostic)
+
+                # Per-vehicle index for O(limit) history lookups
+                if vehicle_id not in self._per_vehicle:
+                    self._per_vehicle[vehicle_id] = deque(maxlen=self.max_buffer_size)
+                self._per_vehicle[vehicle_id].append(diagnostic)
+
+                # Update vehicle profile
+                self.vehicle_profiles[vehicle_id]["last_diagnostic"] = diagnostic.timestamp
+                self.vehicle_profiles[vehicle_id]["diagnostics_count"] += 1
             
-            logger.info(f"Diagnostics collected for {vehicle_id}: {len(dtc_codes)} DTCs")
+            logger.info("Diagnostics collected for %s: %d DTCs", vehicle_id, len(dtc_codes))
             return diagnostic
         except Exception as e:
-            logger.error(f"Failed to collect diagnostics: {e}")
+            logger.error("Failed to collect diagnostics: %s", e)
             return None
     
     def get_vehicle_diagnostics(self, vehicle_id: str, limit: int = 10) -> List[VehicleDiagnostics]:
@@ -126,7 +151,13 @@ class DiagnosticsCollector:
         Returns:
             List of VehicleDiagnostics
         """
-        return [d for d in self.diagnostics_buffer if d.vehicle_id == vehicle_id][-limit:]
+        # Collectors run concurrently from scan_fleet's thread pool and
+        # a deque raises if it is mutated while being iterated
+        with self._lock:
+            history = self._per_vehicle.get(vehicle_id)
+            if not history:
+                return []
+            return list(islice(reversed(history), limit))[::-1]
     
     def get_fleet_summary(self) -> Dict[str, Any]:
         """
@@ -136,14 +167,10 @@ class DiagnosticsCollector:
             Dictionary with fleet statistics
         """
         total_vehicles = len(self.vehicle_profiles)
-        vehicles_with_dtc = sum(
-            1 for d in self.diagnostics_buffer 
-            if len(d.dtc_codes) > 0
-        )
-        
+
         return {
             "total_vehicles": total_vehicles,
-            "vehicles_with_dtc": vehicles_with_dtc,
+            "vehicles_with_dtc": self._with_dtc_count,
             "total_diagnostics_collected": len(self.diagnostics_buffer),
             "buffer_usage": f"{len(self.diagnostics_buffer)}/{self.max_buffer_size}",
         }
@@ -160,30 +187,57 @@ class DiagnosticsCollector:
             bool: True if export successful
         """
         try:
+            # Snapshot under the lock so a scan running concurrently
+            # cannot mutate the deque mid-iteration
+            data: List[VehicleDiagnostics]
             if vehicle_id:
                 data = self.get_vehicle_diagnostics(vehicle_id)
             else:
-                data = self.diagnostics_buffer
-            
-            export_data = [
-                {
-                    "vehicle_id": d.vehicle_id,
-                    "timestamp": d.timestamp,
-                    "dtc_codes": d.dtc_codes,
-                    "engine_data": d.engine_data,
-                    "emission_data": d.emission_data,
-                    "performance_data": d.performance_data,
-                }
-                for d in data
-            ]
-            
-            with open(filepath, 'w') as f:
-                json.dump(export_data, f, indent=2)
-            
-            logger.info(f"Diagnostics exported to {filepath}")
+                with self._lock:
+                    data = list(self.diagnostics_buffer)
+
+            if orjson is not None:
+                # orjson serializes the whole batch to bytes in one call
+                export_data = [
+                    {
+                        "vehicle_id": d.vehicle_id,
+                        "timestamp": d.timestamp,
+                        "dtc_codes": d.dtc_codes,
+                        "engine_data": d.engine_data,
+                        "emission_data": d.emission_data,
+                        "performance_data": d.performance_data,
+                    }
+                    for d in data
+                ]
+                with open(filepath, 'wb', buffering=1 << 20) as f:
+                    f.write(orjson.dumps(export_data))
+            else:
+                # Stream records one at a time through a large write
+                # buffer instead of materializing the full export list
+                with open(filepath, 'w', buffering=1 << 20) as f:
+                    f.write('[')
+                    first = True
+                    for d in data:
+                        if not first:
+                            f.write(',')
+                        json.dump(
+                            {
+                                "vehicle_id": d.vehicle_id,
+                                "timestamp": d.timestamp,
+                                "dtc_codes": d.dtc_codes,
+                                "engine_data": d.engine_data,
+                                "emission_data": d.emission_data,
+                                "performance_data": d.performance_data,
+                            },
+                            f,
+                        )
+                        first = False
+                    f.write(']')
+
+            logger.info("Diagnostics exported to %s", filepath)
             return True
         except Exception as e:
-            logger.error(f"Export failed: {e}")
+            logger.error("Export failed: %s", e)
             return False
     
     def get_vehicles(self) -> List[str]:
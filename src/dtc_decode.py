@@ -0,0 +1,88 @@
+"""
+DTC Decode Module
+Decodes raw SAE J2012 diagnostic trouble code values into display strings
+"""
+
+import logging
+from typing import Iterable, List
+
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # numpy/numba are optional accelerators
+    np = None
+
+try:
+    import numba  # type: ignore[import-not-found]
+except ImportError:
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# First DTC character is selected by the top two bits of the code
+_DTC_LETTERS = "PCBU"
+_HEX_DIGITS = "0123456789ABCDEF"
+
+if np is not None:
+    _LETTERS_U8 = np.frombuffer(b"PCBU", dtype=np.uint8)
+    _HEX_U8 = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+
+def decode_dtc(code: int) -> str:
+    """
+    Decode a single 16-bit raw DTC value into its J2012 string
+
+    Args:
+        code: Raw DTC value (two high bytes of the DTC record)
+
+    Returns:
+        Five-character code such as "P0101"
+    """
+    return (
+        _DTC_LETTERS[(code >> 14) & 0x3]
+        + _HEX_DIGITS[(code >> 12) & 0x3]
+        + _HEX_DIGITS[(code >> 8) & 0xF]
+        + _HEX_DIGITS[(code >> 4) & 0xF]
+        + _HEX_DIGITS[code & 0xF]
+    )
+
+
+def _decode_dtcs_py(codes: Iterable[int]) -> List[str]:
+    """Pure-Python batch decode fallback"""
+    return [decode_dtc(int(code)) for code in codes]
+
+
+if numba is not None and np is not None:
+
+    @numba.njit(cache=True)
+    def _decode_dtcs_njit(codes):
+        """Decode uint32 codes into an (N, 5) matrix of ASCII bytes"""
+        out = np.empty((codes.size, 5), dtype=np.uint8)
+        for i in range(codes.size):
+            code = codes[i]
+            out[i, 0] = _LETTERS_U8[(code >> 14) & 0x3]
+            out[i, 1] = _HEX_U8[(code >> 12) & 0x3]
+            out[i, 2] = _HEX_U8[(code >> 8) & 0xF]
+            out[i, 3] = _HEX_U8[(code >> 4) & 0xF]
+            out[i, 4] = _HEX_U8[code & 0xF]
+        return out
+
+
+def decode_dtc_codes(codes: Iterable[int]) -> List[str]:
+    """
+    Decode a batch of raw DTC values into J2012 strings
+
+    Uses a JIT-compiled decoder (cached across processes) when numba is
+    available, otherwise falls back to the pure-Python loop.
+
+    Args:
+        codes: Raw 16-bit DTC values
+
+    Returns:
+        List of five-character DTC codes
+    """
+    if numba is not None and np is not None:
+        # fromiter accepts generators, matching the fallback; asarray
+        # would raise on anything that is not already a sequence
+        matrix = _decode_dtcs_njit(np.fromiter(codes, dtype=np.uint32))
+        return [bytes(row).decode('ascii') for row in matrix]
+    return _decode_dtcs_py(codes)
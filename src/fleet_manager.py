@@ -3,10 +3,14 @@ Fleet Manager Module
 Manages multiple vehicles and coordinates fleet diagnostics
 """
 
+import asyncio
 import logging
+import sys
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from src.canfd_handler import CANFDHandler
@@ -15,8 +19,27 @@ from src.diagnostics_collector import DiagnosticsCollector
 
 logger = logging.getLogger(__name__)
 
+# Invariant skeleton of a diagnostic sample; copied per vehicle instead
+# of rebuilding three dict literals on every scan. Fields sourced from
+# live UDS reads overwrite the defaults once wired up.
+_DIAG_TEMPLATE: Dict[str, Dict[str, Any]] = {
+    "engine_data": {
+        "rpm": 0,
+        "coolant_temp": 90,
+        "intake_air_temp": 45,
+    },
+    "emission_data": {
+        "o2_sensor_1": 0.8,
+        "co2_level": 250,
+    },
+    "performance_data": {
+        "fuel_consumption": 8.5,
+        "acceleration": 6.2,
+    },
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class FleetVehicle:
     """Fleet vehicle record"""
     vehicle_id: str
@@ -46,6 +69,12 @@ class FleetManager:
         self.max_concurrent_diagnostics = max_concurrent_diagnostics
         self.diagnostic_threads: List[threading.Thread] = []
         self.lock = threading.Lock()
+        # Recent results by vehicle_id; rapid re-scans of a stable vehicle
+        # skip the UDS round-trip for up to _diag_ttl seconds
+        self._diag_cache: Dict[str, tuple] = {}
+        self._diag_ttl = 5.0
+        # Maintained under self.lock so status reads need no iteration
+        self._online_count = 0
         logger.info("Fleet Manager initialized")
     
     def add_vehicle(
@@ -70,7 +99,14 @@ class FleetManager:
             bool: True if vehicle added successfully
         """
         try:
+            # Interned ids make every later dict lookup a pointer compare
+            vehicle_id = sys.intern(vehicle_id)
             with self.lock:
+                # Re-adding replaces the record with a fresh offline one;
+                # drop the old record's contribution to the counter
+                existing = self.vehicles.get(vehicle_id)
+                if existing is not None and existing.online:
+                    self._online_count -= 1
                 vehicle = FleetVehicle(
                     vehicle_id=vehicle_id,
                     vin=vin,
@@ -88,10 +124,10 @@ class FleetManager:
                         "year": year,
                     }
                 )
-                logger.info(f"Vehicle added to fleet: {vehicle_id} ({make} {model})")
+                logger.info("Vehicle added to fleet: %s (%s %s)", vehicle_id, make, model)
                 return True
         except Exception as e:
-            logger.error(f"Failed to add vehicle: {e}")
+            logger.error("Failed to add vehicle: %s", e)
             return False
     
     def remove_vehicle(self, vehicle_id: str) -> bool:
@@ -99,11 +135,14 @@ class FleetManager:
         try:
             with self.lock:
                 if vehicle_id in self.vehicles:
+                    if self.vehicles[vehicle_id].online:
+                        self._online_count -= 1
                     del self.vehicles[vehicle_id]
-                    logger.info(f"Vehicle removed from fleet: {vehicle_id}")
+                    self._diag_cache.pop(vehicle_id, None)
+                    logger.info("Vehicle removed from fleet: %s", vehicle_id)
                     return True
         except Exception as e:
-            logger.error(f"Failed to remove vehicle: {e}")
+            logger.error("Failed to remove vehicle: %s", e)
         return False
     
     def update_vehicle_status(self, vehicle_id: str, online: bool) -> bool:
@@ -111,13 +150,17 @@ class FleetManager:
         try:
             with self.lock:
                 if vehicle_id in self.vehicles:
+                    if self.vehicles[vehicle_id].online != online:
+                        self._online_count += 1 if online else -1
                     self.vehicles[vehicle_id].online = online
-                    self.vehicles[vehicle_id].last_seen = datetime.now().timestamp()
+                    self.vehicles[vehicle_id].last_seen = time.time()
+                    if not online:
+                        self._diag_cache.pop(vehicle_id, None)
                     status = "online" if online else "offline"
-                    logger.info(f"Vehicle {vehicle_id} is now {status}")
+                    logger.info("Vehicle %s is now %s", vehicle_id, status)
                     return True
         except Exception as e:
-            logger.error(f"Failed to update vehicle status: {e}")
+            logger.error("Failed to update vehicle status: %s", e)
         return False
     
     def connect_fleet(self) -> bool:
@@ -127,7 +170,7 @@ class FleetManager:
                 logger.info("Fleet connection established")
                 return True
         except Exception as e:
-            logger.error(f"Fleet connection failed: {e}")
+            logger.error("Fleet connection failed: %s", e)
         return False
     
     def disconnect_fleet(self) -> bool:
@@ -138,94 +181,161 @@ class FleetManager:
             logger.info("Fleet connection closed")
             return True
         except Exception as e:
-            logger.error(f"Fleet disconnection failed: {e}")
+            logger.error("Fleet disconnection failed: %s", e)
         return False
     
-    def perform_diagnostics(self, vehicle_id: str) -> Optional[Dict]:
+    def perform_diagnostics(
+        self,
+        vehicle_id: str,
+        dtcs: Optional[List] = None,
+    ) -> Optional[Dict]:
         """
         Perform diagnostics on a specific vehicle
-        
+
         Args:
             vehicle_id: Vehicle identifier
-        
+            dtcs: Pre-fetched (code, description) tuples from a bulk
+                read; when given, skips the per-vehicle UDS round-trip
+
         Returns:
             Diagnostic results dictionary or None
         """
         if vehicle_id not in self.vehicles:
-            logger.warning(f"Vehicle {vehicle_id} not found")
+            logger.warning("Vehicle %s not found", vehicle_id)
             return None
-        
+
+        cached = self._diag_cache.get(vehicle_id)
+        if cached and time.time() - cached[0] < self._diag_ttl:
+            logger.debug("Using cached diagnostics for %s", vehicle_id)
+            return cached[1]
+
         try:
             vehicle = self.vehicles[vehicle_id]
-            logger.info(f"Starting diagnostics for {vehicle_id}...")
+            logger.info("Starting diagnostics for %s...", vehicle_id)
             
-            # Read DTCs
-            dtc_codes = [code for code, _ in self.uds_client.read_dtc()]
+            # Read DTCs (unless pre-fetched by a bulk scan)
+            if dtcs is None:
+                dtcs = self.uds_client.read_dtc()
+            dtc_codes = [code for code, _ in dtcs]
             
             # Collect diagnostics
+            tpl = _DIAG_TEMPLATE
             diagnostic = self.diagnostics_collector.collect_diagnostics(
                 vehicle_id=vehicle_id,
                 dtc_codes=dtc_codes,
-                engine_data={
-                    "rpm": 0,
-                    "coolant_temp": 90,
-                    "intake_air_temp": 45,
-                },
-                emission_data={
-                    "o2_sensor_1": 0.8,
-                    "co2_level": 250,
-                },
-                performance_data={
-                    "fuel_consumption": 8.5,
-                    "acceleration": 6.2,
-                },
+                engine_data=tpl["engine_data"].copy(),
+                emission_data=tpl["emission_data"].copy(),
+                performance_data=tpl["performance_data"].copy(),
             )
             
-            logger.info(f"Diagnostics completed for {vehicle_id}: {len(dtc_codes)} DTCs found")
-            return {
+            logger.info("Diagnostics completed for %s: %d DTCs found", vehicle_id, len(dtc_codes))
+            result = {
                 "vehicle_id": vehicle_id,
                 "dtc_count": len(dtc_codes),
                 "dtc_codes": dtc_codes,
             }
+            self._diag_cache[vehicle_id] = (time.time(), result)
+            return result
         except Exception as e:
-            logger.error(f"Diagnostics failed for {vehicle_id}: {e}")
+            logger.error("Diagnostics failed for %s: %s", vehicle_id, e)
             return None
     
     def scan_fleet(self) -> Dict[str, Any]:
         """
         Scan entire fleet for diagnostics
-        
+
+        Diagnostics are I/O-bound (UDS reads, CAN frames), so vehicles are
+        scanned concurrently on a thread pool bounded by
+        max_concurrent_diagnostics.
+
         Returns:
             Dictionary with scan results
         """
         logger.info("Starting fleet-wide diagnostics scan...")
-        results = {
-            "total_vehicles": len(self.vehicles),
+        with self.lock:
+            vehicle_ids = list(self.vehicles.keys())
+
+        results: Dict[str, Any] = {
+            "total_vehicles": len(vehicle_ids),
             "vehicles_scanned": 0,
             "vehicles_with_issues": 0,
             "total_dtcs": 0,
             "scan_time": datetime.now().isoformat(),
         }
+
+        # One broadcast DTC read for the whole fleet, then process the
+        # demultiplexed responses concurrently
+        fleet_dtcs = self.uds_client.read_dtc_bulk(vehicle_ids)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_diagnostics) as executor:
+            futures = [
+                executor.submit(self.perform_diagnostics, vehicle_id, fleet_dtcs.get(vehicle_id))
+                for vehicle_id in vehicle_ids
+            ]
+            for future in futures:
+                result = future.result()
+                if result:
+                    results["vehicles_scanned"] += 1
+                    if result["dtc_count"] > 0:
+                        results["vehicles_with_issues"] += 1
+                        results["total_dtcs"] += result["dtc_count"]
         
-        for vehicle_id in self.vehicles:
-            result = self.perform_diagnostics(vehicle_id)
+        logger.info("Fleet scan complete: %d/%d vehicles scanned", results['vehicles_scanned'], results['total_vehicles'])
+        return results
+    
+    async def scan_fleet_async(self) -> Dict[str, Any]:
+        """
+        Scan entire fleet for diagnostics on an event loop
+
+        asyncio counterpart of scan_fleet: the per-vehicle DTC reads
+        are gathered so their round-trips overlap, making scan time
+        track the slowest ECU once vehicles have their own transports.
+
+        Returns:
+            Dictionary with scan results
+        """
+        logger.info("Starting async fleet-wide diagnostics scan...")
+        with self.lock:
+            vehicle_ids = list(self.vehicles.keys())
+
+        results: Dict[str, Any] = {
+            "total_vehicles": len(vehicle_ids),
+            "vehicles_scanned": 0,
+            "vehicles_with_issues": 0,
+            "total_dtcs": 0,
+            "scan_time": datetime.now().isoformat(),
+        }
+
+        fleet_dtcs = await asyncio.gather(
+            *(self.uds_client.read_dtc_async() for _ in vehicle_ids)
+        )
+
+        for vehicle_id, dtcs in zip(vehicle_ids, fleet_dtcs):
+            result = self.perform_diagnostics(vehicle_id, dtcs)
             if result:
                 results["vehicles_scanned"] += 1
                 if result["dtc_count"] > 0:
                     results["vehicles_with_issues"] += 1
                     results["total_dtcs"] += result["dtc_count"]
-        
-        logger.info(f"Fleet scan complete: {results['vehicles_scanned']}/{results['total_vehicles']} vehicles scanned")
+
+        logger.info("Async fleet scan complete: %d/%d vehicles scanned",
+                    results['vehicles_scanned'], results['total_vehicles'])
         return results
-    
+
     def get_fleet_status(self) -> Dict[str, Any]:
-        """Get current fleet status"""
-        online_vehicles = sum(1 for v in self.vehicles.values() if v.online)
-        
+        """
+        Get current fleet status
+
+        Reads the counters maintained by the write paths, so the status
+        snapshot is O(1) and never iterates the fleet.
+        """
+        total_vehicles = len(self.vehicles)
+        online_vehicles = self._online_count
+
         return {
-            "total_vehicles": len(self.vehicles),
+            "total_vehicles": total_vehicles,
             "online_vehicles": online_vehicles,
-            "offline_vehicles": len(self.vehicles) - online_vehicles,
+            "offline_vehicles": total_vehicles - online_vehicles,
             "diagnostics_summary": self.diagnostics_collector.get_fleet_summary(),
         }
     
@@ -3,14 +3,44 @@ UDS (Unified Diagnostic Services) Client Module
 Handles UDS protocol communication and diagnostic requests
 """
 
+import array
+import asyncio
+import codecs
+import functools
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import ClassVar, Dict, Final, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import IntEnum
 import struct
+import weakref
+
+from src.dtc_decode import decode_dtc
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # only needed for the opt-in mypyc build
+
+    def mypyc_attr(**kwargs):  # type: ignore[misc]
+        def decorator(cls):
+            return cls
+        return decorator
+
 
 logger = logging.getLogger(__name__)
 
+# Pre-compiled so the format string is parsed once, not per DID
+_DID_STRUCT = struct.Struct(">H")
+
+# Codec resolved once at import; skips the per-call registry lookup
+# that bytes.decode('ascii', ...) performs
+_ASCII_DECODE = codecs.getdecoder('ascii')
+
+
+@functools.lru_cache(maxsize=32)
+def _dids_struct(n: int) -> struct.Struct:
+    """Struct packing n big-endian data identifiers in one call"""
+    return struct.Struct(">" + "H" * n)
+
 
 class UDSService(IntEnum):
     """UDS Service IDs"""
@@ -36,7 +66,139 @@ class UDSSessionType(IntEnum):
     SAFETY_SYSTEM = 0x04
 
 
-@dataclass
+# Hot-path service ids as Final module constants: no IntEnum member
+# lookup at call time, and AOT compilers (mypyc) can fold them as
+# literals. UDSService stays the public enum surface.
+SID_SESSION_CONTROL: Final = 0x10
+SID_CLEAR_DTC: Final = 0x14
+SID_READ_DTC: Final = 0x19
+SID_READ_DATA_BY_ID: Final = 0x22
+SID_TESTER_PRESENT: Final = 0x3E
+
+# Invariant single-byte service headers and fixed PDUs, built once at
+# import instead of via bytes([...]) on every request
+_HDR_READ_DID = bytes((SID_READ_DATA_BY_ID,))
+_RESP_READ_DID = bytes((SID_READ_DATA_BY_ID + 0x40,))
+_HDR_READ_DTC = bytes((SID_READ_DTC,))
+_HDR_TESTER_PRESENT = bytes((SID_TESTER_PRESENT,))
+_PDU_CLEAR_DTC = bytes((SID_CLEAR_DTC, 0xFF, 0xFF, 0xFF))
+
+# Payload lengths of known data identifiers; anything else defaults to
+# a single byte until its record layout is wired up
+_DID_LENGTHS = {
+    0xF190: 17,  # VIN
+}
+
+# SAE J2012 descriptions for known trouble codes
+_DTC_DESCRIPTIONS: Dict[str, str] = {
+    "P0101": "Mass Air Flow (MAF) Sensor Range/Performance",
+    "P0102": "Mass Air Flow (MAF) Sensor Low Input",
+}
+
+# DTC record layout per ISO 14229: 3-byte trouble code + status byte
+_DTC_REC = struct.Struct(">BBBB")
+
+# Placeholder raw ReadDTCInformation response: positive SID and status
+# availability mask, then one 4-byte record per stored DTC
+_RAW_DTC_RESPONSE = bytes((
+    SID_READ_DTC + 0x40, 0xFF,
+    0x01, 0x01, 0x00, 0x2F,  # P0101
+    0x01, 0x02, 0x00, 0x2F,  # P0102
+))
+
+
+@functools.lru_cache(maxsize=64)
+def _build_rdid_pdu(dids: Tuple[int, ...]) -> bytes:
+    """
+    Prebuilt ReadDataByIdentifier request for a DID tuple
+
+    Diagnostic workflows poll the same few identifiers (VIN, odometer,
+    ECU serial) over and over; the bounded cache makes those repeat
+    requests a dict hit with no packing at all.
+    """
+    return _HDR_READ_DID + _dids_struct(len(dids)).pack(*dids)
+
+
+def _reassemble_isotp(frames: List[bytes]) -> bytes:
+    """
+    Reassemble an ISO 15765-2 (ISO-TP) segmented payload
+
+    Pure function: allocates the output buffer once from the First
+    Frame length field and copies each Consecutive Frame's data into
+    place through memoryviews, avoiding repeated bytes concatenation.
+
+    Args:
+        frames: Raw CAN frames in sequence order; either a lone Single
+            Frame or a First Frame followed by Consecutive Frames
+
+    Returns:
+        Reassembled payload bytes
+
+    Raises:
+        ValueError: If the frames are empty, malformed, or truncated
+    """
+    if not frames:
+        raise ValueError("No frames to reassemble")
+
+    first = frames[0]
+    pci_type = first[0] >> 4
+    if pci_type == 0x0:  # Single Frame
+        length = first[0] & 0x0F
+        return bytes(first[1:1 + length])
+    if pci_type != 0x1:  # First Frame
+        raise ValueError(f"Unexpected PCI type 0x{pci_type:X} in first frame")
+
+    length = ((first[0] & 0x0F) << 8) | first[1]
+    buf = bytearray(length)
+    out = memoryview(buf)
+
+    chunk = memoryview(first)[2:]
+    copied = min(len(chunk), length)
+    out[:copied] = chunk[:copied]
+
+    for frame in frames[1:]:
+        if copied >= length:
+            break
+        if frame[0] >> 4 != 0x2:  # Consecutive Frame
+            raise ValueError("Non-consecutive frame in ISO-TP transfer")
+        chunk = memoryview(frame)[1:]
+        n = min(len(chunk), length - copied)
+        out[copied:copied + n] = chunk[:n]
+        copied += n
+
+    if copied != length:
+        raise ValueError(f"Truncated ISO-TP transfer: {copied}/{length} bytes")
+    return bytes(buf)
+
+
+def _parse_rdid_response(resp: bytes) -> Dict[int, bytes]:
+    """
+    Parse a ReadDataByIdentifier positive response in one pass
+
+    Walks the reassembled response buffer positionally (DID, payload,
+    DID, payload, ...) instead of issuing one exchange per identifier.
+
+    Args:
+        resp: Response PDU starting with the positive response SID
+
+    Returns:
+        Dictionary mapping data_id to data bytes
+    """
+    results: Dict[int, bytes] = {}
+    view = memoryview(resp)
+    end = len(view)
+    offset = 1  # skip the response SID
+    unpack_from = _DID_STRUCT.unpack_from
+    while offset < end:
+        (did,) = unpack_from(view, offset)
+        offset += 2
+        length = _DID_LENGTHS.get(did, 1)
+        results[did] = bytes(view[offset:offset + length])
+        offset += length
+    return results
+
+
+@dataclass(slots=True)
 class UDSResponse:
     """UDS Response structure"""
     service_id: int
@@ -45,9 +207,40 @@ class UDSResponse:
     error_code: Optional[int] = None
 
 
+# Compiled as a regular Python class: mypyc native classes cannot be
+# weakly referenced (breaking the keepalive WeakSet) and the read
+# services are rebound per instance on connect/disconnect
+@mypyc_attr(native_class=False)
 class UDSClient:
     """UDS Diagnostic Services Client"""
-    
+
+    # Slots drop the per-instance __dict__ (one client per vehicle at
+    # fleet scale); __weakref__ is needed for the keepalive WeakSet
+    __slots__ = (
+        'address_ta',
+        'address_ta_rx',
+        'current_session',
+        'is_connected',
+        'sequence_counter',
+        '_pdu_buf',
+        # Rebound on connect/disconnect (see below)
+        'read_dtc',
+        'read_data_by_identifier',
+        '__weakref__',
+    )
+
+    # Prebuilt DiagnosticSessionControl PDU per session type; changing
+    # session is then a dict lookup with no byte assembly
+    _SESSION_PDU: ClassVar[Dict[UDSSessionType, bytes]] = {
+        session: bytes((SID_SESSION_CONTROL, int(session)))
+        for session in UDSSessionType
+    }
+
+    # One keepalive heartbeat shared by every connected client instead
+    # of a timer thread per vehicle; clients register on connect
+    _keepalive_clients: ClassVar["weakref.WeakSet"] = weakref.WeakSet()
+    _keepalive_task: ClassVar[Optional["asyncio.Task"]] = None
+
     def __init__(self, address_ta: int = 0x7DF, address_ta_rx: int = 0x7E8):
         """
         Initialize UDS Client
@@ -56,12 +249,20 @@ class UDSClient:
             address_ta: Transmission address (default broadcast)
             address_ta_rx: Transmission address receive
         """
-        self.address_ta = address_ta
-        self.address_ta_rx = address_ta_rx
+        self.address_ta: int = address_ta
+        self.address_ta_rx: int = address_ta_rx
         self.current_session = UDSSessionType.DEFAULT
-        self.is_connected = False
-        self.sequence_counter = 0
-        logger.info(f"UDS Client initialized (TA: 0x{address_ta:X}, TA_RX: 0x{address_ta_rx:X})")
+        self.is_connected: bool = False
+        self.sequence_counter: int = 0
+        # Reusable request buffer sized to the largest ISO-TP PDU;
+        # hot paths pack into it instead of allocating fresh bytes
+        self._pdu_buf = bytearray(4096)
+        # The hot read services are bound to their disconnected
+        # variants here and swapped on connect/disconnect, removing
+        # the is_connected branch from every call
+        self.read_dtc = self._read_dtc_disconnected
+        self.read_data_by_identifier = self._read_data_by_identifier_disconnected
+        logger.info("UDS Client initialized (TA: 0x%X, TA_RX: 0x%X)", address_ta, address_ta_rx)
     
     def connect(self) -> bool:
         """
@@ -73,17 +274,70 @@ class UDSClient:
         try:
             logger.info("Initiating UDS session...")
             self.is_connected = True
+            self.read_dtc = self._read_dtc_connected
+            self.read_data_by_identifier = self._read_data_by_identifier_connected
+            UDSClient._keepalive_clients.add(self)
             logger.info("UDS session established")
             return True
         except Exception as e:
-            logger.error(f"Failed to establish UDS session: {e}")
+            logger.error("Failed to establish UDS session: %s", e)
             return False
-    
+
     def disconnect(self) -> bool:
         """Disconnect UDS session"""
         self.is_connected = False
+        self.read_dtc = self._read_dtc_disconnected
+        self.read_data_by_identifier = self._read_data_by_identifier_disconnected
+        UDSClient._keepalive_clients.discard(self)
         logger.info("UDS session closed")
         return True
+
+    @classmethod
+    def start_keepalive(cls, interval: float = 2.0) -> "asyncio.Task":
+        """
+        Start the shared tester-present heartbeat task
+
+        A single coroutine services every connected client each
+        interval with one precomputed PDU and one gather, instead of
+        one timer thread per vehicle.
+
+        Args:
+            interval: Seconds between heartbeats
+
+        Returns:
+            The running keepalive task
+        """
+        if cls._keepalive_task is None or cls._keepalive_task.done():
+            cls._keepalive_task = asyncio.get_running_loop().create_task(
+                cls._keepalive_loop(interval)
+            )
+        return cls._keepalive_task
+
+    @classmethod
+    def stop_keepalive(cls) -> bool:
+        """Cancel the shared keepalive task if it is running"""
+        if cls._keepalive_task is not None and not cls._keepalive_task.done():
+            cls._keepalive_task.cancel()
+            cls._keepalive_task = None
+            return True
+        return False
+
+    @classmethod
+    async def _keepalive_loop(cls, interval: float):
+        """Drain the registered clients with one batch per interval"""
+        pdu = _HDR_TESTER_PRESENT + b"\x00"
+        while True:
+            clients = list(cls._keepalive_clients)
+            if clients:
+                await asyncio.gather(*(c._send_keepalive(pdu) for c in clients))
+            await asyncio.sleep(interval)
+
+    async def _send_keepalive(self, pdu: bytes) -> bool:
+        """Send one precomputed tester-present PDU to this client"""
+        # Placeholder transport await, as in read_dtc_async
+        await asyncio.sleep(0)
+        logger.debug("Tester present sent")
+        return True
     
     def session_control(self, session_type: UDSSessionType) -> bool:
         """
@@ -98,73 +352,203 @@ class UDSClient:
         if not self.is_connected:
             logger.warning("Not connected")
             return False
-        
-        try:
-            service_data = bytes([UDSService.SESSION_CONTROL, session_type])
-            self.current_session = session_type
-            logger.info(f"Changed to session: {session_type.name}")
-            return True
-        except Exception as e:
-            logger.error(f"Session control failed: {e}")
+
+        # Callers may pass raw ints from config; only the known session
+        # types have a prebuilt PDU
+        service_data = self._SESSION_PDU.get(session_type)
+        if service_data is None:
+            logger.warning("Unknown session type: %#x", session_type)
             return False
+        session_type = UDSSessionType(session_type)
+        self.current_session = session_type
+        logger.info("Changed to session: %s", session_type.name)
+        return True
     
-    def read_data_by_identifier(self, data_ids: List[int]) -> Dict[int, bytes]:
+    def _read_data_by_identifier_connected(self, data_ids: List[int]) -> Dict[int, bytes]:
         """
         Read data by identifier (Service 0x22)
-        
+
+        Exposed as read_data_by_identifier while connected.
+
         Args:
             data_ids: List of data identifiers to read
-        
+
         Returns:
             Dictionary mapping data_id to data bytes
         """
-        if not self.is_connected:
-            logger.warning("Not connected")
-            return {}
-        
-        results = {}
         try:
-            service_data = bytes([UDSService.READ_DATA_BY_ID]) + b"".join(
-                struct.pack(">H", did) for did in data_ids
-            )
-            logger.info(f"Reading {len(data_ids)} data identifiers")
-            
+            # Repeated polls of the same DID set reuse the cached PDU
+            service_data = _build_rdid_pdu(tuple(data_ids))
+            logger.info("Reading %d data identifiers", len(data_ids))
+
+            # Placeholder response: positive SID echo followed by
+            # DID + zeroed payload per identifier. A real transport
+            # returns one reassembled PDU of the same shape.
+            resp = bytearray(_RESP_READ_DID)
             for did in data_ids:
-                results[did] = b"\x00"  # Placeholder
-            
-            return results
+                resp += _DID_STRUCT.pack(did)
+                resp += b"\x00" * _DID_LENGTHS.get(did, 1)
+
+            return _parse_rdid_response(bytes(resp))
         except Exception as e:
-            logger.error(f"Read data by ID failed: {e}")
+            logger.error("Read data by ID failed: %s", e)
             return {}
+
+    def _read_data_by_identifier_disconnected(self, data_ids: List[int]) -> Dict[int, bytes]:
+        """read_data_by_identifier while no session is established"""
+        logger.warning("Not connected")
+        return {}
     
-    def read_dtc(self, status_mask: int = 0xFF) -> List[Tuple[str, str]]:
+    def read_dids_soa(self, data_ids: List[int]) -> Tuple[array.array, List[memoryview]]:
+        """
+        Read data identifiers into a structure-of-arrays layout
+
+        Alternative to read_data_by_identifier for large DID sweeps:
+        identifiers come back in a typed array and each payload is a
+        zero-copy memoryview into the single response buffer, so no
+        per-DID dict insert or bytes copy happens. Consumers iterate
+        with zip(dids, payloads).
+
+        Args:
+            data_ids: List of data identifiers to read
+
+        Returns:
+            Tuple of (array of DIDs, list of payload memoryviews)
+        """
+        if not self.is_connected:
+            logger.warning("Not connected")
+            return array.array('H'), []
+
+        try:
+            buf = self._pdu_buf
+            buf[0] = SID_READ_DATA_BY_ID
+            _dids_struct(len(data_ids)).pack_into(buf, 1, *data_ids)
+            service_data = memoryview(buf)[:1 + 2 * len(data_ids)]
+            logger.info("Reading %d data identifiers (SoA)", len(data_ids))
+
+            # Placeholder response, same layout as read_data_by_identifier
+            resp = bytearray(_RESP_READ_DID)
+            for did in data_ids:
+                resp += _DID_STRUCT.pack(did)
+                resp += b"\x00" * _DID_LENGTHS.get(did, 1)
+
+            view = memoryview(resp)
+            payloads: List[memoryview] = []
+            offset = 1
+            for did in data_ids:
+                offset += 2
+                length = _DID_LENGTHS.get(did, 1)
+                payloads.append(view[offset:offset + length])
+                offset += length
+            return array.array('H', data_ids), payloads
+        except Exception as e:
+            logger.error("SoA DID read failed: %s", e)
+            return array.array('H'), []
+
+    def iter_dtc(self, status_mask: int = 0xFF) -> Iterator[Tuple[str, str]]:
+        """
+        Stream Diagnostic Trouble Codes as they are parsed
+
+        Generator counterpart of read_dtc: each (code, description)
+        tuple is yielded straight from its 4-byte response record, so
+        a caller can display or forward the first DTC after one record
+        of parse time instead of waiting for the full list.
+
+        Args:
+            status_mask: DTC status mask
+
+        Yields:
+            (DTC_code, DTC_description) tuples
+        """
+        if not self.is_connected:
+            logger.warning("Not connected")
+            return
+
+        service_data = _HDR_READ_DTC + bytes((status_mask,))
+        logger.info("Reading DTCs...")
+
+        # Decode 4-byte records straight from the response buffer; the
+        # record walk happens in C via iter_unpack, not Python slicing.
+        # Local alias keeps the lookup out of LOAD_GLOBAL per element.
+        resp = _RAW_DTC_RESPONSE
+        descriptions = _DTC_DESCRIPTIONS
+        for hi, mid, _low, _status in _DTC_REC.iter_unpack(memoryview(resp)[2:]):
+            code = decode_dtc((hi << 8) | mid)
+            yield (code, descriptions.get(code, "Unknown DTC"))
+
+    def _read_dtc_connected(self, status_mask: int = 0xFF) -> List[Tuple[str, str]]:
         """
         Read Diagnostic Trouble Codes (Service 0x19)
-        
+
+        Exposed as read_dtc while connected; materializes iter_dtc.
+
         Args:
             status_mask: DTC status mask
-        
+
+        Returns:
+            List of (DTC_code, DTC_description) tuples
+        """
+        return list(self.iter_dtc(status_mask))
+
+    def _read_dtc_disconnected(self, status_mask: int = 0xFF) -> List[Tuple[str, str]]:
+        """read_dtc while no session is established"""
+        logger.warning("Not connected")
+        return []
+    
+    async def read_dtc_async(self, status_mask: int = 0xFF) -> List[Tuple[str, str]]:
+        """
+        Read Diagnostic Trouble Codes without blocking the event loop
+
+        Awaitable form of read_dtc; a fleet scan can gather one of
+        these per client so the per-ECU round-trips overlap instead of
+        running back to back.
+
+        Args:
+            status_mask: DTC status mask
+
         Returns:
             List of (DTC_code, DTC_description) tuples
         """
         if not self.is_connected:
             logger.warning("Not connected")
             return []
-        
+
+        # Placeholder yield; a real transport awaits the ISO-TP
+        # response here
+        await asyncio.sleep(0)
+        return self.read_dtc(status_mask)
+
+    def read_dtc_bulk(self, vehicle_ids: List[str], status_mask: int = 0xFF) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Read DTCs for several vehicles with one functional request
+
+        Issues a single broadcast ReadDTCInformation request on the
+        functional address and demultiplexes the per-ECU responses,
+        instead of one request/response round-trip per vehicle.
+
+        Args:
+            vehicle_ids: Vehicle identifiers to read DTCs for
+            status_mask: DTC status mask applied to all vehicles
+
+        Returns:
+            Dictionary mapping vehicle_id to its list of
+            (DTC_code, DTC_description) tuples
+        """
+        if not self.is_connected:
+            logger.warning("Not connected")
+            return {}
+
         try:
-            service_data = bytes([UDSService.READ_DTC, status_mask])
-            logger.info("Reading DTCs...")
-            
-            # Placeholder DTCs
-            dtcs = [
-                ("P0101", "Mass Air Flow (MAF) Sensor Range/Performance"),
-                ("P0102", "Mass Air Flow (MAF) Sensor Low Input"),
-            ]
-            return dtcs
+            service_data = _HDR_READ_DTC + bytes((status_mask,))
+            logger.info("Reading DTCs for %d vehicles (broadcast)...", len(vehicle_ids))
+
+            # Placeholder: each responding ECU reports the same DTC set
+            dtcs = [(code, _DTC_DESCRIPTIONS[code]) for code in ("P0101", "P0102")]
+            return {vehicle_id: list(dtcs) for vehicle_id in vehicle_ids}
         except Exception as e:
-            logger.error(f"Read DTC failed: {e}")
-            return []
-    
+            logger.error("Bulk DTC read failed: %s", e)
+            return {}
+
     def clear_dtc(self) -> bool:
         """
         Clear Diagnostic Trouble Codes (Service 0x14)
@@ -176,13 +560,9 @@ class UDSClient:
             logger.warning("Not connected")
             return False
         
-        try:
-            service_data = bytes([UDSService.CLEAR_DTC, 0xFF, 0xFF, 0xFF])
-            logger.info("Clearing DTCs...")
-            return True
-        except Exception as e:
-            logger.error(f"Clear DTC failed: {e}")
-            return False
+        service_data = _PDU_CLEAR_DTC
+        logger.info("Clearing DTCs...")
+        return True
     
     def tester_present(self, sub_function: int = 0x00) -> bool:
         """
@@ -194,13 +574,9 @@ class UDSClient:
         Returns:
             bool: True if successful
         """
-        try:
-            service_data = bytes([UDSService.TESTER_PRESENT, sub_function])
-            logger.debug("Tester present sent")
-            return True
-        except Exception as e:
-            logger.error(f"Tester present failed: {e}")
-            return False
+        service_data = _HDR_TESTER_PRESENT + bytes((sub_function,))
+        logger.debug("Tester present sent")
+        return True
     
     def get_vehicle_identification(self, data_id: int = 0xF190) -> Optional[str]:
         """
@@ -215,7 +591,8 @@ class UDSClient:
         result = self.read_data_by_identifier([data_id])
         if data_id in result:
             try:
-                return result[data_id].decode('ascii', errors='ignore')
+                decoded, _ = _ASCII_DECODE(result[data_id], 'ignore')
+                return decoded
             except Exception:
                 return None
         return None
@@ -13,20 +13,31 @@ from src.fleet_manager import FleetManager
 from src.canfd_handler import CANFDHandler
 from src.uds_client import UDSClient
 from src.diagnostics_collector import DiagnosticsCollector
+from src.dtc_decode import decode_dtc, decode_dtc_codes
+from src.uds_client import _reassemble_isotp
+
+
+class TestFleetManagerDefaults(unittest.TestCase):
+    """Test Fleet Manager construction (read-only, shared instance)"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Construct one manager for all read-only tests"""
+        cls.fleet = FleetManager()
+
+    def test_fleet_initialization(self):
+        """Test fleet initialization"""
+        self.assertIsNotNone(self.fleet)
+        self.assertEqual(len(self.fleet.vehicles), 0)
 
 
 class TestFleetManager(unittest.TestCase):
     """Test Fleet Manager functionality"""
-    
+
     def setUp(self):
         """Set up test fixtures"""
         self.fleet = FleetManager()
-    
-    def test_fleet_initialization(self):
-        """Test fleet initialization"""
-        self.assertIsNotNone(self.fleet)
-        self.assertEqual(len(self.fleet.vehicles), 0)
-    
+
     def test_add_vehicle(self):
         """Test adding vehicle to fleet"""
         result = self.fleet.add_vehicle(
@@ -73,18 +84,27 @@ class TestFleetManager(unittest.TestCase):
         self.fleet.disconnect_fleet()
 
 
+class TestCANFDHandlerDefaults(unittest.TestCase):
+    """Test CAN-FD Handler construction (read-only, shared instance)"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Construct one handler for all read-only tests"""
+        cls.handler = CANFDHandler()
+
+    def test_handler_initialization(self):
+        """Test handler initialization"""
+        self.assertIsNotNone(self.handler)
+        self.assertEqual(self.handler.bitrate, 500000)
+
+
 class TestCANFDHandler(unittest.TestCase):
     """Test CAN-FD Handler functionality"""
-    
+
     def setUp(self):
         """Set up test fixtures"""
         self.handler = CANFDHandler()
-    
-    def test_handler_initialization(self):
-        """Test handler initialization"""
-        self.assertIsNotNone(self.handler)
-        self.assertEqual(self.handler.bitrate, 500000)
-    
+
     def test_connect_disconnect(self):
         """Test connect and disconnect"""
         result = self.handler.connect()
@@ -113,18 +133,27 @@ class TestCANFDHandler(unittest.TestCase):
         self.handler.disconnect()
 
 
+class TestUDSClientDefaults(unittest.TestCase):
+    """Test UDS Client construction (read-only, shared instance)"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Construct one client for all read-only tests"""
+        cls.uds = UDSClient()
+
+    def test_client_initialization(self):
+        """Test client initialization"""
+        self.assertIsNotNone(self.uds)
+        self.assertEqual(self.uds.address_ta, 0x7DF)
+
+
 class TestUDSClient(unittest.TestCase):
     """Test UDS Client functionality"""
-    
+
     def setUp(self):
         """Set up test fixtures"""
         self.uds = UDSClient()
-    
-    def test_client_initialization(self):
-        """Test client initialization"""
-        self.assertIsNotNone(self.uds)
-        self.assertEqual(self.uds.address_ta, 0x7DF)
-    
+
     def test_connect_disconnect(self):
         """Test connect and disconnect"""
         result = self.uds.connect()
@@ -142,19 +171,49 @@ class TestUDSClient(unittest.TestCase):
         self.assertIsInstance(dtcs, list)
         self.uds.disconnect()
 
+    def test_iter_dtc(self):
+        """Test streaming DTC iteration"""
+        self.uds.connect()
+        first = next(self.uds.iter_dtc())
+        self.assertEqual(first[0], "P0101")
+        self.uds.disconnect()
+
+    def test_isotp_reassembly_single_frame(self):
+        """Test ISO-TP single frame reassembly"""
+        payload = _reassemble_isotp([b"\x03\x62\xf1\x90"])
+        self.assertEqual(payload, b"\x62\xf1\x90")
+
+    def test_isotp_reassembly_multi_frame(self):
+        """Test ISO-TP multi-frame reassembly"""
+        frames = [
+            b"\x10\x0a\x01\x02\x03\x04\x05\x06",
+            b"\x21\x07\x08\x09\x0a\xff\xff\xff",
+        ]
+        payload = _reassemble_isotp(frames)
+        self.assertEqual(payload, bytes(range(1, 11)))
+
+
+class TestDiagnosticsCollectorDefaults(unittest.TestCase):
+    """Test Diagnostics Collector construction (read-only, shared instance)"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Construct one collector for all read-only tests"""
+        cls.collector = DiagnosticsCollector()
+
+    def test_collector_initialization(self):
+        """Test collector initialization"""
+        self.assertIsNotNone(self.collector)
+        self.assertEqual(len(self.collector.vehicle_profiles), 0)
+
 
 class TestDiagnosticsCollector(unittest.TestCase):
     """Test Diagnostics Collector functionality"""
-    
+
     def setUp(self):
         """Set up test fixtures"""
         self.collector = DiagnosticsCollector()
-    
-    def test_collector_initialization(self):
-        """Test collector initialization"""
-        self.assertIsNotNone(self.collector)
-        self.assertEqual(len(self.collector.vehicles), 0)
-    
+
     def test_add_vehicle(self):
         """Test adding vehicle"""
         result = self.collector.add_vehicle(
@@ -182,5 +241,19 @@ class TestDiagnosticsCollector(unittest.TestCase):
         self.assertIn("vehicles_with_dtc", summary)
 
 
+class TestDTCDecode(unittest.TestCase):
+    """Test DTC decoding"""
+
+    def test_decode_single_dtc(self):
+        """Test decoding a single raw DTC value"""
+        self.assertEqual(decode_dtc(0x0101), "P0101")
+        self.assertEqual(decode_dtc(0x4123), "C0123")
+
+    def test_decode_dtc_batch(self):
+        """Test decoding a batch of raw DTC values"""
+        codes = decode_dtc_codes([0x0101, 0x0102])
+        self.assertEqual(codes, ["P0101", "P0102"])
+
+
 if __name__ == "__main__":
     unittest.main()